@@ -4,16 +4,25 @@ Manually extract the grid positions from spawnblocks.tiff
 Based on visual inspection, the grid appears to be 7x6 with some spots blocked by windmill
 """
 
-from PIL import Image
 import numpy as np
 import cv2
 import json
 
-# Load the image
-img_pil = Image.open('spawnblocks.tiff')
-img_pil_rgb = img_pil.convert('RGB')
-img_np = np.array(img_pil_rgb)
-img_cv = cv2.cvtColor(img_np, cv2.COLOR_RGB2BGR)
+try:
+    import orjson
+except ImportError:  # optional, falls back to the stdlib encoder
+    orjson = None
+
+from grid_pipeline import load_and_mask
+
+# Only block centers are needed, so run detection on a downscaled copy and
+# scale coordinates back up afterwards
+SCALE = 2
+
+# Let's detect the individual green squares more carefully
+# Green detection - be more specific
+masked = load_and_mask('spawnblocks.tiff', green_range=((40, 50, 50), (80, 255, 255)), scale=SCALE)
+img_cv = masked.image
 
 print(f"Image dimensions: {img_cv.shape}")
 
@@ -26,68 +35,68 @@ print(f"Image dimensions: {img_cv.shape}")
 # - It forms a diamond/rectangular pattern on the isometric platform
 # - Each cell appears to be roughly the same size
 
-# Let's detect the individual green squares more carefully
-hsv = cv2.cvtColor(img_cv, cv2.COLOR_BGR2HSV)
-
-# Green detection - be more specific
-green_low = np.array([40, 50, 50])
-green_high = np.array([80, 255, 255])
-green_mask = cv2.inRange(hsv, green_low, green_high)
-
-# Apply morphological operations to clean up
+# Apply a single opening to clean up speckle (a preceding close did not change
+# the detected blocks, so it was dropped)
 kernel = np.ones((3,3), np.uint8)
-green_mask = cv2.morphologyEx(green_mask, cv2.MORPH_CLOSE, kernel)
-green_mask = cv2.morphologyEx(green_mask, cv2.MORPH_OPEN, kernel)
+green_mask = cv2.morphologyEx(masked.green_mask, cv2.MORPH_OPEN, kernel, borderType=cv2.BORDER_REPLICATE)
 
-# Find contours
-contours, _ = cv2.findContours(green_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+# Label the green regions; stats holds x, y, w, h, area per label in one array
+_, _, stats, _ = cv2.connectedComponentsWithStats(green_mask, connectivity=8)
 
-# Filter contours by area to get only the grid squares
-grid_blocks = []
+# Filter regions by area to get only the grid squares
 MIN_AREA = 5000  # Minimum area for a grid square
 MAX_AREA = 50000  # Maximum area for a grid square
 
-for contour in contours:
-    area = cv2.contourArea(contour)
-    if MIN_AREA < area < MAX_AREA:
-        x, y, w, h = cv2.boundingRect(contour)
-        # Filter by aspect ratio - grid squares should be roughly square-ish in screen space
-        aspect = w / h if h > 0 else 0
-        if 0.5 < aspect < 3.0:  # Allow for isometric distortion
-            grid_blocks.append({
-                'x': x,
-                'y': y,
-                'width': w,
-                'height': h,
-                'center_x': x + w//2,
-                'center_y': y + h//2,
-                'area': area
-            })
+# Areas are measured on the downscaled mask, compare in full-resolution pixels
+boxes = stats[:, :4] * SCALE
+areas = stats[:, cv2.CC_STAT_AREA] * SCALE * SCALE
+ws = boxes[:, 2]
+hs = boxes[:, 3]
+# Filter by aspect ratio - grid squares should be roughly square-ish in screen space
+aspect = ws / np.maximum(hs, 1)
+keep = (areas > MIN_AREA) & (areas < MAX_AREA) & (aspect > 0.5) & (aspect < 3.0)  # Allow for isometric distortion
+keep[0] = False  # label 0 is the background
+
+grid_blocks = [
+    {
+        'x': x,
+        'y': y,
+        'width': w,
+        'height': h,
+        'center_x': x + w//2,
+        'center_y': y + h//2,
+        'area': area
+    }
+    for (x, y, w, h), area in zip(boxes[keep].tolist(), areas[keep].tolist())
+]
 
 # Sort blocks by position (top-left to bottom-right)
 grid_blocks.sort(key=lambda b: (b['y'] // 50, b['x']))
 
 print(f"\nFound {len(grid_blocks)} grid blocks for sheep spawning")
 
-# Create visualization
-vis = img_cv.copy()
+# Create visualization as a quarter-resolution preview instead of copying the
+# full TIFF; block coordinates stay in full-resolution pixels
+VIS_SCALE = 4
+vis = cv2.resize(img_cv, (img_cv.shape[1] // VIS_SCALE, img_cv.shape[0] // VIS_SCALE),
+                 interpolation=cv2.INTER_AREA)
 for i, block in enumerate(grid_blocks):
     # Draw rectangles
-    cv2.rectangle(vis, (block['x'], block['y']),
-                  (block['x'] + block['width'], block['y'] + block['height']),
-                  (0, 255, 0), 3)
+    cv2.rectangle(vis, (block['x'] // VIS_SCALE, block['y'] // VIS_SCALE),
+                  ((block['x'] + block['width']) // VIS_SCALE, (block['y'] + block['height']) // VIS_SCALE),
+                  (0, 255, 0), 1)
     # Add numbers - make them more visible
-    cv2.putText(vis, str(i+1), (block['center_x']-15, block['center_y']+10),
-                cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 0, 255), 3)
+    cv2.putText(vis, str(i+1), (block['center_x'] // VIS_SCALE - 4, block['center_y'] // VIS_SCALE + 3),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.35, (255, 0, 255), 1)
 
 # Save results
 cv2.imwrite('grid_blocks_detected.png', vis)
 cv2.imwrite('green_mask_clean.png', green_mask)
 
-# Also create a clean version showing just the centers
-centers_img = np.zeros_like(img_cv)
+# Also create a clean version showing just the centers, at the preview size
+centers_img = np.zeros(vis.shape, np.uint8)
 for block in grid_blocks:
-    cv2.circle(centers_img, (block['center_x'], block['center_y']), 10, (0, 255, 255), -1)
+    cv2.circle(centers_img, (block['center_x'] // VIS_SCALE, block['center_y'] // VIS_SCALE), 3, (0, 255, 255), -1)
 
 cv2.imwrite('grid_centers.png', centers_img)
 
@@ -114,11 +123,20 @@ grid_data = {
     ]
 }
 
-with open('sheep_spawn_grid.json', 'w') as f:
-    json.dump(grid_data, f, indent=2)
+if orjson is not None:
+    with open('sheep_spawn_grid.json', 'wb') as f:
+        f.write(orjson.dumps(grid_data, option=orjson.OPT_INDENT_2))
+else:
+    with open('sheep_spawn_grid.json', 'w') as f:
+        json.dump(grid_data, f, indent=2)
 
 print(f"\n✓ Saved {len(grid_blocks)} spawn positions to sheep_spawn_grid.json")
+# Debug images are written below full resolution: the mask at the 1/SCALE
+# detection size, the two overlays at the 1/VIS_SCALE preview size
 print("\nVisualization files created:")
-print("- grid_blocks_detected.png: Shows all detected spawn blocks with numbers")
-print("- green_mask_clean.png: Binary mask of green areas")
-print("- grid_centers.png: Just the center points for spawn positions")
\ No newline at end of file
+print(f"- grid_blocks_detected.png: Shows all detected spawn blocks with numbers "
+      f"({vis.shape[1]}x{vis.shape[0]}, 1/{VIS_SCALE} scale)")
+print(f"- green_mask_clean.png: Binary mask of green areas "
+      f"({green_mask.shape[1]}x{green_mask.shape[0]}, 1/{SCALE} scale)")
+print(f"- grid_centers.png: Just the center points for spawn positions "
+      f"({centers_img.shape[1]}x{centers_img.shape[0]}, 1/{VIS_SCALE} scale)")
\ No newline at end of file
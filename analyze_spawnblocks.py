@@ -3,60 +3,59 @@
 Analyze spawnblocks.tiff to understand the grid layout for sheep spawning
 """
 
-from PIL import Image
 import numpy as np
 import cv2
 
-# Load and convert the TIFF image
-img_pil = Image.open('spawnblocks.tiff')
-img_pil_rgb = img_pil.convert('RGB')
-img_np = np.array(img_pil_rgb)
-img_cv = cv2.cvtColor(img_np, cv2.COLOR_RGB2BGR)
-
-# Save as PNG for viewing
-cv2.imwrite('spawnblocks_view.png', img_cv)
-print(f"Image dimensions: {img_cv.shape}")
+from grid_pipeline import load_and_mask
 
 # First detect the light blue grid lines
 # Then find the green squares within
-hsv = cv2.cvtColor(img_cv, cv2.COLOR_BGR2HSV)
-
 # Light blue detection - adjust for the specific blue in the image
 # This blue appears to be around H=100-110 in OpenCV scale
-blue_low = np.array([95, 150, 150])
-blue_high = np.array([115, 255, 255])
-blue_mask = cv2.inRange(hsv, blue_low, blue_high)
+masked = load_and_mask('spawnblocks.tiff',
+                       green_range=((35, 40, 40), (85, 255, 255)),  # green spawn squares
+                       blue_range=((95, 150, 150), (115, 255, 255)))
+img_cv = masked.image
+green_mask = masked.green_mask
+blue_mask = masked.blue_mask
 
-# Green detection for the spawn squares
-green_low = np.array([35, 40, 40])
-green_high = np.array([85, 255, 255])
-green_mask = cv2.inRange(hsv, green_low, green_high)
+# Save as PNG for viewing
+cv2.imwrite('spawnblocks_view.png', img_cv)
+print(f"Image dimensions: {img_cv.shape}")
 
-# Find contours of the green spawn squares
+# Label the green spawn squares; stats holds x, y, w, h, area per label
 # We'll look for green areas that are surrounded by blue (the grid)
-contours, _ = cv2.findContours(green_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-print(f"Found {len(contours)} green regions")
-
-# Also check blue regions for debugging
-blue_contours, _ = cv2.findContours(blue_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-print(f"Found {len(blue_contours)} blue grid regions")
+num_green, labels, stats, _ = cv2.connectedComponentsWithStats(green_mask, connectivity=8)
+print(f"Found {num_green - 1} green regions")
+
+# Also check blue regions for debugging - only the count is needed
+num_blue, _ = cv2.connectedComponents(blue_mask, connectivity=8)
+print(f"Found {num_blue - 1} blue grid regions")
+
+# Analyze each grid block (label 0 is the background)
+# Filter out noise by the area enclosed by each region's outline, as contourArea
+# measured it: by Pick's theorem that is pixels - boundary pixels / 2 - 1, so thin
+# outline fragments (mostly boundary) are rejected even when they have >100 pixels
+cross = cv2.getStructuringElement(cv2.MORPH_CROSS, (3, 3))
+boundary = cv2.subtract(green_mask, cv2.erode(green_mask, cross, borderType=cv2.BORDER_CONSTANT, borderValue=0))
+boundary_px = np.bincount(labels[boundary > 0], minlength=num_green)
+enclosed = stats[:, cv2.CC_STAT_AREA] - boundary_px / 2 - 1
+keep = enclosed[1:] > 100
+block_stats = stats[1:][keep]
+block_labels = np.flatnonzero(keep) + 1
 
-# Analyze each grid block
 grid_blocks = []
-for i, contour in enumerate(contours):
-    x, y, w, h = cv2.boundingRect(contour)
-    area = cv2.contourArea(contour)
-    if area > 100:  # Filter out noise
-        grid_blocks.append({
-            'id': i,
-            'x': x,
-            'y': y,
-            'width': w,
-            'height': h,
-            'center_x': x + w//2,
-            'center_y': y + h//2,
-            'area': area
-        })
+for i, (x, y, w, h, area) in zip(block_labels.tolist(), block_stats.tolist()):
+    grid_blocks.append({
+        'id': i,
+        'x': x,
+        'y': y,
+        'width': w,
+        'height': h,
+        'center_x': x + w//2,
+        'center_y': y + h//2,
+        'area': area
+    })
 
 # Sort blocks by position (top to bottom, left to right)
 grid_blocks.sort(key=lambda b: (b['y'] // 50, b['x']))
@@ -93,9 +92,9 @@ print("- spawnblocks_green_mask.png: Detected green spawn areas")
 
 # Calculate grid layout
 if grid_blocks:
-    # Find grid dimensions
-    x_coords = sorted(set(b['x'] for b in grid_blocks))
-    y_coords = sorted(set(b['y'] for b in grid_blocks))
+    # Find grid dimensions straight from the kept stats rows
+    x_coords = np.unique(block_stats[:, cv2.CC_STAT_LEFT])
+    y_coords = np.unique(block_stats[:, cv2.CC_STAT_TOP])
 
     print(f"\nGrid layout:")
     print(f"  Columns: {len(x_coords)}")
@@ -103,6 +102,6 @@ if grid_blocks:
     print(f"  Total spots: {len(grid_blocks)}")
 
     # Average block size
-    avg_width = sum(b['width'] for b in grid_blocks) / len(grid_blocks)
-    avg_height = sum(b['height'] for b in grid_blocks) / len(grid_blocks)
+    avg_width = block_stats[:, cv2.CC_STAT_WIDTH].mean()
+    avg_height = block_stats[:, cv2.CC_STAT_HEIGHT].mean()
     print(f"  Average block size: {avg_width:.1f} x {avg_height:.1f} pixels")
\ No newline at end of file
@@ -3,36 +3,61 @@
 Convert farm+windmill TIFF files to PNG format for React Native
 """
 
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from PIL import Image
 import os
 
-def convert_tiff_to_png(input_file, output_file):
-    """Convert a TIFF image to PNG format"""
+try:
+    import pyvips
+except ImportError:  # optional, multithreaded streaming encoder
+    pyvips = None
+
+def convert_tiff_to_png(input_file, output_file, compress_level=3):
+    """Convert a TIFF image to PNG format (zlib compress_level 0-9)
+
+    Returns the report to print, so parallel workers don't interleave output.
+    """
     try:
-        # Open the TIFF image
-        img = Image.open(input_file)
+        vips_img = None
+        if pyvips is not None:
+            vips_img = pyvips.Image.new_from_file(input_file, access='sequential')
+            # libvips only handles 8-bit RGB/RGBA; other modes go through Pillow's
+            # convert('RGBA') so both backends give the same PNG
+            if not (vips_img.format == 'uchar' and vips_img.interpretation == 'srgb'
+                    and vips_img.bands in (3, 4)):
+                vips_img = None
 
-        # Convert to RGB if necessary (TIFF might have different modes)
-        if img.mode != 'RGB' and img.mode != 'RGBA':
-            img = img.convert('RGBA')
+        if vips_img is not None:
+            # Stream the TIFF through libvips' threaded PNG encoder. Metadata,
+            # including the ICC profile, is kept as on the Pillow path, and rows
+            # are filtered adaptively like libpng does (pngsave defaults to none)
+            vips_img.write_to_file(output_file, compression=compress_level, filter='all')
+            dimensions = (vips_img.width, vips_img.height)
+        else:
+            # Open the TIFF image
+            img = Image.open(input_file)
 
-        # Save as PNG
-        img.save(output_file, 'PNG', optimize=True)
+            # Convert to RGB if necessary (TIFF might have different modes)
+            if img.mode not in ('RGB', 'RGBA'):
+                img = img.convert('RGBA')
+
+            # Save as PNG - a single deflate pass, optimize=True retries the encode
+            img.save(output_file, 'PNG', compress_level=compress_level)
+            dimensions = img.size
 
         # Get file sizes for comparison
         input_size = os.path.getsize(input_file) / (1024 * 1024)  # MB
         output_size = os.path.getsize(output_file) / (1024 * 1024)  # MB
 
-        print(f"✓ Converted {input_file} -> {output_file}")
-        print(f"  Input size: {input_size:.2f} MB")
-        print(f"  Output size: {output_size:.2f} MB")
-        print(f"  Dimensions: {img.size}")
+        return (f"✓ Converted {input_file} -> {output_file}\n"
+                f"  Input size: {input_size:.2f} MB\n"
+                f"  Output size: {output_size:.2f} MB\n"
+                f"  Dimensions: {dimensions}")
 
     except Exception as e:
-        print(f"✗ Error converting {input_file}: {e}")
-        return False
-
-    return True
+        return f"✗ Error converting {input_file}: {e}"
 
 # Convert both windmill frames
 files_to_convert = [
@@ -40,8 +65,30 @@ files_to_convert = [
     ('farm+windmill-2.tiff', 'farm-windmill-2.png')
 ]
 
-for input_file, output_file in files_to_convert:
-    if os.path.exists(input_file):
-        convert_tiff_to_png(input_file, output_file)
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--compress-level', type=int, default=3, choices=range(10),
+                        help='PNG zlib level: 3 is fast, 9 gives smaller release assets')
+    args = parser.parse_args()
+
+    pending = []
+    for input_file, output_file in files_to_convert:
+        if os.path.exists(input_file):
+            pending.append((input_file, output_file))
+        else:
+            print(f"✗ File not found: {input_file}")
+
+    convert = partial(convert_tiff_to_png, compress_level=args.compress_level)
+    if pending and pyvips is not None:
+        # libvips already encodes with all cores, so convert one file at a time
+        reports = [convert(input_file, output_file) for input_file, output_file in pending]
+    elif pending:
+        # Each file converts independently, so spread them over worker processes
+        with ProcessPoolExecutor(max_workers=min(len(pending), os.cpu_count() or 1)) as executor:
+            reports = list(executor.map(convert, *zip(*pending)))
     else:
-        print(f"✗ File not found: {input_file}")
\ No newline at end of file
+        reports = []
+
+    # Print in input order from the parent process
+    for report in reports:
+        print(report)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Shared TIFF decode + HSV masking for the spawnblocks analysis scripts
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from PIL import Image
+import numpy as np
+import cv2
+
+
+@dataclass(frozen=True)
+class MaskedImage:
+    image: np.ndarray  # full-resolution BGR
+    green_mask: np.ndarray  # at 1/scale resolution, like blue_mask
+    blue_mask: Optional[np.ndarray]  # None when no blue range was requested
+
+
+def load_and_mask(path, green_range, blue_range=None, scale=1):
+    """Load an image and threshold it in HSV
+
+    Ranges are ((h, s, v), (h, s, v)) tuples. Masks are computed on a copy
+    downscaled by `scale`.
+    """
+    image = _load_image(path)
+    small = image
+    if scale != 1:
+        small = cv2.resize(image, (image.shape[1] // scale, image.shape[0] // scale),
+                           interpolation=cv2.INTER_AREA)
+    hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV)
+
+    green_mask = cv2.inRange(hsv, np.array(green_range[0]), np.array(green_range[1]))
+    blue_mask = None
+    if blue_range is not None:
+        blue_mask = cv2.inRange(hsv, np.array(blue_range[0]), np.array(blue_range[1]))
+    return MaskedImage(image, green_mask, blue_mask)
+
+
+def _load_image(path):
+    # Decode the raw samples and drop alpha the way PIL's convert('RGB') does.
+    # IMREAD_COLOR would keep premultiplied colour for associated-alpha TIFFs,
+    # darkening the low-alpha fringe the green detection relies on
+    image = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+    if image is None:
+        raise ValueError(f"Could not read {path}")
+    if image.ndim == 2:
+        return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+    if image.shape[2] == 3:
+        return image
+
+    bgr = image[:, :, :3]
+    if _has_associated_alpha(path):
+        alpha = image[:, :, 3:].astype(np.uint16)
+        # Widen before multiplying: NumPy 1.x would keep uint8 * scalar as uint8
+        unpremultiplied = np.minimum(bgr.astype(np.uint16) * 255 // np.maximum(alpha, 1), 255)
+        bgr = np.where(alpha > 0, unpremultiplied, bgr).astype(np.uint8)
+    return np.ascontiguousarray(bgr)
+
+
+def _has_associated_alpha(path):
+    # Header-only read: TIFF ExtraSamples == 1 means premultiplied alpha
+    with Image.open(path) as img:
+        extra_samples = getattr(img, 'tag_v2', {}).get(338)
+        return extra_samples in (1, (1,))
@@ -7,6 +7,10 @@ import cv2 as cv
 import numpy as np
 import json
 
+# HSV range treated as grass green, shared by every frame
+HSV_GREEN_LOW = np.array([35, 40, 40], np.uint8)
+HSV_GREEN_HIGH = np.array([90, 255, 255], np.uint8)
+
 # Load the current grass contour from the JSON file
 try:
     with open('utils/grass_contour.json', 'r') as f:
@@ -40,10 +44,10 @@ for input_file, output_file in images_to_process:
             cv.drawContours(vis, [contour], -1, (0, 0, 255), 3)  # Red thick line
 
         # Method 2: Also detect green areas fresh to compare (in blue)
-        hsv = cv.cvtColor(img, cv.COLOR_BGR2HSV)
-        hsv_green_low = (35, 40, 40)
-        hsv_green_high = (90, 255, 255)
-        green_mask = cv.inRange(hsv, np.array(hsv_green_low), np.array(hsv_green_high))
+        # Go through a UMat so OpenCV can run cvtColor/inRange on OpenCL when a
+        # device is available; only the final mask is copied back to the host
+        hsv = cv.cvtColor(cv.UMat(img), cv.COLOR_BGR2HSV)
+        green_mask = cv.inRange(hsv, HSV_GREEN_LOW, HSV_GREEN_HIGH).get()
 
         # Find contours in current image
         current_contours, _ = cv.findContours(green_mask, cv.RETR_EXTERNAL, cv.CHAIN_APPROX_SIMPLE)
@@ -52,10 +56,9 @@ for input_file, output_file in images_to_process:
             cv.drawContours(vis, [largest], -1, (255, 0, 0), 2)  # Blue thin line
 
         # Add a semi-transparent green overlay on the detected area
-        overlay = vis.copy()
-        mask_colored = cv.cvtColor(green_mask, cv.COLOR_GRAY2BGR)
-        mask_colored[:, :, 0] = 0  # Remove blue channel
-        mask_colored[:, :, 2] = 0  # Remove red channel
+        # Build the green-only mask image in one pass (blue and red channels zero)
+        zero = np.zeros_like(green_mask)
+        mask_colored = cv.merge([zero, green_mask, zero])
         overlay = cv.addWeighted(vis, 0.7, mask_colored, 0.3, 0)
 
         # Add legend